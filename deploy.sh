@@ -1,7 +1,7 @@
 #!/bin/bash
 # shellcheck disable=SC1090,SC2034
 
-trap "[[ -f ./lavalink_pipe ]] && rm ./lavalink_pipe && exit 0 || exit 0" SIGINT
+trap "exit 0" SIGINT
 
 declare LAVALINK_DIR
 declare VENV_ACTIVATION_SCRIPT
@@ -97,17 +97,10 @@ start_lavalink() {
         printf "Couldn't find the Lavalink directory in %s!\n" "$LAVALINK_DIR"
         return 1
     fi
-    mkfifo lavalink_pipe
-    pipe=$(realpath lavalink_pipe)
-    (cd "$LAVALINK_DIR" && java -jar ./Lavalink.jar > "$pipe" 2>&1 &) 
-    printf "Waiting for Lavalink to be ready...\n"
-    while IFS= read -r line; do
-        if printf "%s" "$line" | grep 'Lavalink is ready to accept connections.' > /dev/null 2>&1; then
-            printf "%sLavalink is ready to accept connections!\nLaunching Kolbot...\e[0m\n" "${GREEN}"
-            break
-        fi
-    done < lavalink_pipe
-    rm lavalink_pipe
+    # Kolbot probes Lavalink for readiness itself, so the JVM boots while the bot logs in.
+    log_file=$(realpath ./logs)/lavalink.log
+    (cd "$LAVALINK_DIR" && java -jar ./Lavalink.jar > "$log_file" 2>&1 &)
+    printf "%sLavalink is starting in the background (logs: %s).\nLaunching Kolbot...\e[0m\n" "${GREEN}" "$log_file"
 }
 
 
@@ -186,24 +179,14 @@ if ! source "$VENV_ACTIVATION_SCRIPT" && ! source "$(find . -name 'activate')";
 fi
 printf "%sVirtual environment activated!\n\e[0m" "${GREEN}"
 
-if ! start_lavalink; then
-    printf >&2 "%sThere was a problem starting Lavalink!\n\e[0m" "${RED}" && exit 1
-fi
-
 if ! [[ -d "./logs" ]] && ! mkdir ./logs; then
     printf >&2 "Couldn't create a logs directory!\n" && exit 1
 fi
 
+if ! start_lavalink; then
+    printf >&2 "%sThere was a problem starting Lavalink!\n\e[0m" "${RED}" && exit 1
+fi
+
 if ! python3 -m kolbot; then
     printf >&2 "%sKolbot encountered a problem! Exiting...\n\e[0m" "${RED}" && exit 1
 fi
-
-# TODO: Listen for "Cannot connect to host" error message and handle it:
-# WARNING wavelink.websocket An unexpected error occurred while connecting Node(identifier=1FJkuhP7V1f4GujL, uri=http://0.0.0.0:2333, status=NodeStatus.CONNECTING, players=0) to Lavalink: 
-# "Cannot connect to host 0.0.0.0:2333 ssl:default [Connect call failed ('0.0.0.0', 2333)]"
-#   * Create a named pipe to kolbot, copying stdout and stderr to it.
-#   * Listen through the named pipe (helper script? backgrounded function process?)
-#   * Exit kolbot if the pipe receives the error message.
-#   * Listen for "Cannot connect to host" or "Connect call failed" in the named pipe.  
-
-
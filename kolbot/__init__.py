@@ -0,0 +1,4 @@
+import time
+
+# Recorded before discord/wavelink are imported so startup timings include import cost.
+STARTED_AT: float = time.perf_counter()
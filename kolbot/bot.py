@@ -1,13 +1,25 @@
 #!/usr/bin/env python3
 import os
+import time
+import aiohttp
 import discord
 import logging
 import wavelink
 import asyncio
+from typing import Coroutine
 from discord.ext import commands
+from kolbot import STARTED_AT
+from kolbot.budgets import IdleReaper
+from kolbot.trace import TraceRecorder
 
 LAVALINK_PASS = os.environ["LAVALINK_PASS"]
+LAVALINK_URI = "http://0.0.0.0:2333"
+# Exponential backoff (seconds) used while probing Lavalink for readiness.
+LAVALINK_PROBE_BACKOFF = 0.5, 10.0
+# How long a command will wait for Lavalink before politely giving up.
+LAVALINK_WAIT_TIMEOUT = 30.0
 PREFIXES = ":", ";", "!", ">", "/", "."
+EXTENSIONS = "kolbot.cogs.music", "kolbot.cogs.general", "kolbot.cogs.owner"
 
 
 class Bot(commands.Bot):
@@ -19,6 +31,16 @@ class Bot(commands.Bot):
         self.remove_command("help")
         self.prefixes: tuple = PREFIXES
         self.connected_channel: discord.VoiceChannel | None = None
+        self.lavalink_ready: asyncio.Event = asyncio.Event()
+        self.lavalink_failed: asyncio.Event = asyncio.Event()
+        self.background_tasks: list[asyncio.Task] = []
+        self.startup_timings: dict[str, float] = {}
+        self.reaper: IdleReaper = IdleReaper(self)
+        # Opt-in: set RECORD_TRACE to a file path (`.gz` to compress) to record command traffic.
+        self.recorder: TraceRecorder | None = (
+            TraceRecorder(trace_path) if (trace_path := os.environ.get("RECORD_TRACE")) else None
+        )
+        self.mark_startup("imports")
 
     @commands.Cog.listener()
     async def on_voice_state_update(
@@ -51,6 +73,29 @@ class Bot(commands.Bot):
                         self.voice_clients[0].cleanup()
                     break
 
+    async def on_wavelink_track_end(self, payload: wavelink.TrackEndEventPayload) -> None:
+        """ Called when a track ends. Only recorded: wavelink's autoplay picks the next track. """
+        if self.recorder and payload.player:
+            self.recorder.event("track_end", payload.player.guild.id, reason=payload.reason)  # type:ignore
+
+    async def on_wavelink_track_exception(
+        self, payload: wavelink.TrackExceptionEventPayload
+    ) -> None:
+        """ Called when Lavalink fails to play a track. """
+        logging.warning(f"Track exception: {payload.track!r} - {payload.exception}")
+        if self.recorder and payload.player:
+            self.recorder.event(
+                "track_exception",
+                payload.player.guild.id,  # type:ignore
+                severity=payload.exception.get("severity"),
+            )
+
+    async def on_wavelink_track_stuck(self, payload: wavelink.TrackStuckEventPayload) -> None:
+        """ Called when a track gets stuck while playing. """
+        logging.warning(f"Track stuck for {payload.threshold}ms: {payload.track!r}")
+        if self.recorder and payload.player:
+            self.recorder.event("track_stuck", payload.player.guild.id, threshold=payload.threshold)  # type:ignore
+
     def setup_logging(self) -> None:
         """
         Set up logging for the bot. 
@@ -79,10 +124,142 @@ class Bot(commands.Bot):
             handler=handler,
         )
 
+    def mark_startup(self, phase: str) -> None:
+        """
+        Record how long after process start a startup phase finished.
+        Once the gateway is up and Lavalink has either connected or failed, the breakdown is logged.
+        """
+        if phase in self.startup_timings:
+            return
+        self.startup_timings[phase] = time.perf_counter() - STARTED_AT
+        lavalink_settled: bool = self.lavalink_ready.is_set() or self.lavalink_failed.is_set()
+        if "gateway_ready" in self.startup_timings and lavalink_settled:
+            breakdown: str = " | ".join(
+                f"{name}: {elapsed:.2f}s" for name, elapsed in self.startup_timings.items()
+            )
+            logging.info(f"Startup timings (since process start): {breakdown}")
+
     async def setup_hook(self) -> None:
-        """ Sets up the bot's wavelink connection. """
-        nodes = [wavelink.Node(uri="http://0.0.0.0:2333", password=LAVALINK_PASS)]
-        await wavelink.Pool.connect(nodes=nodes, client=self, cache_capacity=None)
+        """
+        Loads the command extensions and starts connecting to Lavalink in the background,
+        so the Discord login doesn't wait on the JVM.
+        """
+        for extension in EXTENSIONS:
+            await self.load_extension(extension)
+        self.mark_startup("extensions")
+        self.start_background_task(self.connect_lavalink(), "connect_lavalink")
+        self.start_background_task(self.reaper.run(), "idle_reaper")
+
+    def start_background_task(self, coro: Coroutine, name: str) -> asyncio.Task:
+        """
+        Run a coroutine in the background. The task is kept on the bot so it isn't
+        garbage collected, logged if it fails, and cancelled in `close`.
+        """
+        task: asyncio.Task = self.loop.create_task(coro, name=name)
+        task.add_done_callback(self.log_task_failure)
+        self.background_tasks.append(task)
+        return task
+
+    def log_task_failure(self, task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        if exc := task.exception():
+            logging.error(f"Background task {task.get_name()} failed: {exc!r}", exc_info=exc)
+
+    async def probe_lavalink(self) -> bool:
+        """
+        Poll the Lavalink node until it answers an authenticated request,
+        backing off exponentially between attempts.
+        Returns False if Lavalink rejects the password, since retrying won't help.
+        """
+        delay, max_delay = LAVALINK_PROBE_BACKOFF
+        attempt: int = 0
+        async with aiohttp.ClientSession() as session:
+            while True:
+                attempt += 1
+                try:
+                    async with session.get(
+                        f"{LAVALINK_URI}/version",
+                        headers={"Authorization": LAVALINK_PASS},
+                        timeout=aiohttp.ClientTimeout(total=5),
+                    ) as resp:
+                        if resp.status == 200:
+                            logging.info(
+                                f"Lavalink is ready (version {await resp.text()}, attempt {attempt})."
+                            )
+                            return True
+                        if resp.status in (401, 403):
+                            logging.error(
+                                f"Lavalink rejected the password (HTTP {resp.status}). "
+                                "Check LAVALINK_PASS against Lavalink's application.yml. "
+                                "Giving up on connecting to Lavalink."
+                            )
+                            return False
+                        logging.warning(f"Lavalink probe returned HTTP {resp.status}.")
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    logging.info(
+                        f"Lavalink not ready yet (attempt {attempt}): {e!r}. "
+                        f"Retrying in {delay:.1f}s."
+                    )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, max_delay)
+
+    async def connect_lavalink(self) -> None:
+        """ Waits for Lavalink to come up, then sets up the bot's wavelink connection. """
+        try:
+            if not await self.probe_lavalink():
+                self.lavalink_failed.set()
+                self.mark_startup("lavalink_failed")
+                return
+            self.mark_startup("lavalink_probe")
+            nodes = [wavelink.Node(uri=LAVALINK_URI, password=LAVALINK_PASS)]
+            await wavelink.Pool.connect(nodes=nodes, client=self, cache_capacity=None)
+        except Exception:
+            self.lavalink_failed.set()
+            self.mark_startup("lavalink_failed")
+            raise
+
+    async def wait_for_lavalink(self, ctx: commands.Context) -> bool:
+        """
+        Make sure a Lavalink node is connected before a command uses it.
+        If the node is still starting, tell the user and hold the command until it's ready.
+        Returns False (after letting the user know) if it doesn't come up in time,
+        or if connecting to it has already failed.
+        """
+        if self.lavalink_ready.is_set():
+            return True
+        if not self.lavalink_failed.is_set():
+            await ctx.send("The music server is still starting up. I'll get to your request in a moment...")
+            waiters: set[asyncio.Task] = {
+                asyncio.create_task(self.lavalink_ready.wait()),
+                asyncio.create_task(self.lavalink_failed.wait()),
+            }
+            await asyncio.wait(waiters, timeout=LAVALINK_WAIT_TIMEOUT, return_when=asyncio.FIRST_COMPLETED)
+            for waiter in waiters:
+                waiter.cancel()
+            if self.lavalink_ready.is_set():
+                return True
+        if self.lavalink_failed.is_set():
+            await ctx.send(f"Sorry {ctx.author.mention}, the music server is unavailable right now.")
+        else:
+            await ctx.send(
+                f"Sorry {ctx.author.mention}, the music server isn't ready yet. Please try again shortly."
+            )
+        return False
+
+    async def on_command(self, ctx: commands.Context) -> None:
+        """ Called before a command is invoked. Records it if a trace is being recorded. """
+        if self.recorder:
+            self.recorder.command(ctx)
+
+    async def close(self) -> None:
+        for task in self.background_tasks:
+            task.cancel()
+        await asyncio.gather(*self.background_tasks, return_exceptions=True)
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
+        await super().close()
 
     async def on_ready(self) -> None:
         """ Called when the bot is ready to start working. """
@@ -100,6 +277,7 @@ class Bot(commands.Bot):
             logging.info(f"Set home channel to {self.home_channel}")
         logging.info(f"Logged in: {self.user} - ID: {self.user.id}")  # type:ignore
         logging.info(f"Home channel: {self.home_channel if self.home_channel else 'None'}")
+        self.mark_startup("gateway_ready")
 
     async def on_wavelink_node_ready(
         self, payload: wavelink.NodeReadyEventPayload
@@ -108,6 +286,8 @@ class Bot(commands.Bot):
         logging.info(
             f"Wavelink Node connected: {payload.node!r} | Resumed: {payload.resumed}"
         )
+        self.lavalink_ready.set()
+        self.mark_startup("lavalink_node")
 
     async def on_wavelink_track_start(
         self, payload: wavelink.TrackStartEventPayload
@@ -120,6 +300,12 @@ class Bot(commands.Bot):
 
         original: wavelink.Playable | None = payload.original
         track: wavelink.Playable = payload.track
+        if self.recorder:
+            self.recorder.event(
+                "track_start",
+                player.guild.id,  # type:ignore
+                r=bool(original and original.recommended),
+            )
         embed: discord.Embed = discord.Embed(title="Now Playing")
 
         if track.uri and track.source:
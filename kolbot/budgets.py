@@ -0,0 +1,182 @@
+""" Per-guild resource budgets and the idle player reaper """
+
+import os
+import time
+import heapq
+import asyncio
+import logging
+import discord
+import wavelink
+
+# Budgets are configurable through the environment, like the rest of the bot's settings.
+MAX_QUEUE_LENGTH: int = int(os.environ.get("MAX_QUEUE_LENGTH", 500))
+MAX_QUEUE_DURATION: float = float(os.environ.get("MAX_QUEUE_DURATION", 6 * 60 * 60))
+MAX_PAUSED_IDLE: float = float(os.environ.get("MAX_PAUSED_IDLE", 15 * 60))
+# What to do with an evicted player's queue: "snapshot" keeps it for the next `:play`, "drop" discards it.
+IDLE_QUEUE_POLICIES = "snapshot", "drop"
+IDLE_QUEUE_POLICY: str = os.environ.get("IDLE_QUEUE_POLICY", "snapshot")
+if IDLE_QUEUE_POLICY not in IDLE_QUEUE_POLICIES:
+    logging.warning(
+        f"Unknown IDLE_QUEUE_POLICY {IDLE_QUEUE_POLICY!r} (expected one of {IDLE_QUEUE_POLICIES}). "
+        "Falling back to 'snapshot'."
+    )
+    IDLE_QUEUE_POLICY = "snapshot"
+# How long (seconds) a snapshotted queue is kept if the guild never plays again.
+SNAPSHOT_TTL: float = float(os.environ.get("SNAPSHOT_TTL", 24 * 60 * 60))
+
+
+def track_seconds(track: wavelink.Playable) -> float:
+    """ Length of a track in seconds. Streams don't count towards the duration budget. """
+    return 0.0 if track.is_stream else track.length / 1000
+
+
+def queued_seconds(player: wavelink.Player) -> float:
+    return sum(track_seconds(track) for track in player.queue)
+
+
+def fit_to_budget(
+    player: wavelink.Player, tracks: list[wavelink.Playable]
+) -> list[wavelink.Playable]:
+    """
+    Return the tracks, in order, that fit in the guild's queue length and duration budgets.
+    A track that would go over the duration budget is skipped and the rest keep filling the room.
+    An empty list means none of them can be queued.
+    Enqueue the result before awaiting anything, or another command can fit against the same room.
+    """
+    room: int = MAX_QUEUE_LENGTH - len(player.queue)
+    seconds: float = queued_seconds(player)
+    fitted: list[wavelink.Playable] = []
+    for track in tracks:
+        if len(fitted) >= room:
+            break
+        if seconds + track_seconds(track) > MAX_QUEUE_DURATION:
+            continue
+        seconds += track_seconds(track)
+        fitted.append(track)
+    return fitted
+
+
+class IdleReaper:
+    """
+    Disconnects players that sit paused for longer than `MAX_PAUSED_IDLE`,
+    and forgets snapshotted queues after `SNAPSHOT_TTL`.
+
+    Both are kept in a deadline index (a min-heap of `(deadline, guild_id, kind)`),
+    so the reaper only sleeps until the earliest deadline instead of scanning every player.
+    Entries are invalidated lazily: `deadlines` holds the current deadline per
+    `(kind, guild_id)` and heap entries that don't match it are skipped when popped.
+    """
+
+    def __init__(self, bot: discord.Client) -> None:
+        self.bot: discord.Client = bot
+        self.heap: list[tuple[float, int, str]] = []
+        self.deadlines: dict[tuple[str, int], float] = {}
+        self.snapshots: dict[int, list[wavelink.Playable]] = {}
+        self.wakeup: asyncio.Event = asyncio.Event()
+
+    def touch(self, player: wavelink.Player) -> None:
+        """ Call after a player's paused state may have changed. """
+        if player.paused:
+            self.schedule(player.guild.id, time.monotonic() + MAX_PAUSED_IDLE)  # type:ignore
+        else:
+            self.cancel(player.guild.id)  # type:ignore
+
+    def schedule(self, guild_id: int, deadline: float, kind: str = "idle") -> None:
+        if self.deadlines.get((kind, guild_id)) == deadline:
+            return
+        self.deadlines[(kind, guild_id)] = deadline
+        heapq.heappush(self.heap, (deadline, guild_id, kind))
+        if self.heap[0] == (deadline, guild_id, kind):
+            self.wakeup.set()
+
+    def cancel(self, guild_id: int, kind: str = "idle") -> None:
+        self.deadlines.pop((kind, guild_id), None)
+
+    def player_for(self, guild_id: int) -> wavelink.Player | None:
+        guild: discord.Guild | None = self.bot.get_guild(guild_id)
+        voice: discord.VoiceProtocol | None = guild.voice_client if guild else None
+        return voice if isinstance(voice, wavelink.Player) else None
+
+    async def run(self) -> None:
+        """ Background task: sleep until the next deadline, then evict expired players. """
+        while True:
+            self.wakeup.clear()
+            timeout: float | None = (
+                max(self.heap[0][0] - time.monotonic(), 0) if self.heap else None
+            )
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=timeout)
+                continue
+            except asyncio.TimeoutError:
+                pass
+            now: float = time.monotonic()
+            while self.heap and self.heap[0][0] <= now:
+                deadline, guild_id, kind = heapq.heappop(self.heap)
+                if self.deadlines.get((kind, guild_id)) != deadline:
+                    continue
+                del self.deadlines[(kind, guild_id)]
+                if kind == "snapshot":
+                    tracks: list[wavelink.Playable] = self.snapshots.pop(guild_id, [])
+                    logging.info(f"Dropped expired queue snapshot ({len(tracks)} tracks) for guild {guild_id}")
+                    continue
+                player: wavelink.Player | None = self.player_for(guild_id)
+                if not player or not player.paused:
+                    continue
+                try:
+                    await self.evict(player)
+                except Exception as e:
+                    logging.warning(f"Failed to evict idle player in guild {guild_id}: {e!r}")
+
+    async def evict(self, player: wavelink.Player) -> None:
+        """ Snapshot or drop the player's queue according to `IDLE_QUEUE_POLICY`, then disconnect. """
+        guild_id: int = player.guild.id  # type:ignore
+        tracks: list[wavelink.Playable] = (
+            [player.current, *player.queue] if player.current else list(player.queue)
+        )
+        if IDLE_QUEUE_POLICY == "snapshot" and tracks:
+            self.snapshots[guild_id] = tracks
+            self.schedule(guild_id, time.monotonic() + SNAPSHOT_TTL, "snapshot")
+            note: str = f"Saved {len(tracks)} song(s); they'll be restored on your next `:play`."
+        else:
+            note = "The queue was cleared."
+        player.queue.clear()
+        logging.info(
+            f"Evicting player in guild {guild_id} after {MAX_PAUSED_IDLE:.0f}s paused. "
+            f"Policy: {IDLE_QUEUE_POLICY}, tracks: {len(tracks)}"
+        )
+        if home_channel := getattr(player, "home_channel", None):
+            embed: discord.Embed = discord.Embed(
+                title="Bot Disconnected",
+                description=f"Disconnecting from `{player.channel.name}`.\nReason: paused for too long.\n{note}",
+            )
+            await home_channel.send(embed=embed)
+        await player.disconnect()
+
+    def restore(self, player: wavelink.Player) -> int:
+        """ Put a snapshotted queue back into a fresh player. Returns the number of songs restored. """
+        guild_id: int = player.guild.id  # type:ignore
+        if guild_id not in self.snapshots:
+            return 0
+        self.cancel(guild_id, "snapshot")
+        fitted: list[wavelink.Playable] = fit_to_budget(player, self.snapshots.pop(guild_id))
+        # `Queue.put` only takes a single Playable or a Playlist.
+        for track in fitted:
+            player.queue.put(track)
+        return len(fitted)
+
+    def usage(self) -> dict[int, dict]:
+        """ Current resource usage per guild with a connected player. """
+        now: float = time.monotonic()
+        usage: dict[int, dict] = {}
+        for voice in self.bot.voice_clients:
+            if not isinstance(voice, wavelink.Player) or not voice.guild:
+                continue
+            deadline: float | None = self.deadlines.get(("idle", voice.guild.id))
+            usage[voice.guild.id] = {
+                "guild": voice.guild.name,
+                "queued": len(voice.queue),
+                "seconds": queued_seconds(voice),
+                "paused": voice.paused,
+                "evict_in": max(deadline - now, 0) if deadline else None,
+            }
+        return usage
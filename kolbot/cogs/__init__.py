@@ -0,0 +1 @@
+""" Command extensions (cogs) for the bot. Each one can be reloaded at runtime. """
@@ -0,0 +1,51 @@
+""" General-purpose commands. """
+
+import discord
+from discord.ext import commands
+from kolbot.bot import Bot
+
+CMD_ALIASES = {
+    "help": ["cmd", "commands", "cmds", "h", "man", "docs"],
+}
+
+DOCS = {
+    "help": f"* Displays this help message.\n",
+}
+
+
+class General(commands.Cog):
+    aliases: dict = CMD_ALIASES
+    docs: dict = DOCS
+
+    def __init__(self, bot: Bot) -> None:
+        self.bot: Bot = bot
+
+    @commands.command(name="help", aliases=CMD_ALIASES["help"])
+    async def help(self, ctx: commands.Context) -> None:
+        """`/help` / `:cmd` / `:h` - Get help: Display a list of commands."""
+        embed: discord.Embed = discord.Embed(title="Help")
+        embed.add_field(name="Usage", value=f"{ctx.author} used {ctx.invoked_with}")
+        prefix_msg: str = (
+            f"* Bot prefix(es): `{self.bot.prefixes!r}`\n\t* Usage: `<prefix><command>`\n"
+        )
+        embed.add_field(name="Bot Prefix", value=prefix_msg, inline=False)
+        # Each cog carries its own docs and aliases, so `:reload` picks up edits to them.
+        for cog in self.bot.cogs.values():
+            cog_aliases: dict = getattr(cog, "aliases", {})
+            for cmd, doc in getattr(cog, "docs", {}).items():
+                cmd_alias: str = "\t* Aliases - "
+                for alias in cog_aliases[cmd]:
+                    cmd_alias += (
+                        f"`{alias}`, " if alias != cog_aliases[cmd][-1] else f"`{alias}`\n"
+                    )
+                doc += cmd_alias
+                embed.add_field(name=cmd, value=doc, inline=False)
+        try:
+            await ctx.message.delete()
+        except discord.HTTPException:
+            await ctx.message.add_reaction("😒")
+        await ctx.send(embed=embed)
+
+
+async def setup(bot: Bot) -> None:
+    await bot.add_cog(General(bot))
@@ -0,0 +1,491 @@
+""" Music playback commands. """
+
+import datetime
+import discord
+import wavelink
+from typing import cast
+from discord.ext import commands
+from kolbot.bot import Bot
+from kolbot.budgets import MAX_QUEUE_DURATION, MAX_QUEUE_LENGTH, fit_to_budget, track_seconds
+from kolbot.utils import get_current_queue
+import logging
+
+CMD_ALIASES = {
+    "play": ["p", "add", "a", "addsong"],
+    "pause_resume": ["pause", "unpause", "t", "stop", "start", "resume"],
+    "skip": ["s", "sk", "next", "n"],
+    "volume": ["vol", "v"],
+    "queue": ["vq", "list", "ls", "songs", "playlist"],
+    "state": ["st", "status", "getstate"],
+    "autoplay": ["ap", "auto", "au"],
+    "disconnect": ["dc", "quit", "exit", "q"],
+    "move": ["mv", "change", "switch", "hop"],
+}
+
+DOCS = {
+    "play": f"* Plays a song or playlist from a given URL or search query.\n",
+    "pause_resume": f"* Pauses or resumes playback.\n",
+    "skip": f"* Skips the current song.\n",
+    "volume": f"* Changes the volume of the player (0-50).\n",
+    "queue": f"* Displays the current queue.\n",
+    "state": f"* Displays the current state of the player.\n",
+    "autoplay": f"* Toggles autoplay. Arguments: `on`/`off`/`disable`.\n",
+    "disconnect": f"* Disconnects the player from the voice channel.\n",
+}
+
+
+class Music(commands.Cog):
+    aliases: dict = CMD_ALIASES
+    docs: dict = DOCS
+
+    def __init__(self, bot: Bot) -> None:
+        self.bot: Bot = bot
+
+    @commands.command(aliases=CMD_ALIASES["play"])
+    async def play(self, ctx: commands.Context, *, query: str) -> None:
+        """`:play (URL or search)` - Play song/playlist URL, or search for it\n"""
+        if not ctx.guild:
+            return
+        if not await self.bot.wait_for_lavalink(ctx):
+            return
+        player: wavelink.Player = cast(wavelink.Player, ctx.voice_client)
+        if not player:
+            try:
+                player = await ctx.author.voice.channel.connect(  # type:ignore
+                    cls=wavelink.Player
+                )
+            except AttributeError:
+                await ctx.send("Join a voice channel before using this command.")
+                return
+            except discord.ClientException:
+                await ctx.send(
+                    f"{ctx.author.mention} I was unable to join your voice channel. Please try again."
+                )
+                return
+            if restored := self.bot.reaper.restore(player):
+                await ctx.send(f"Restored {restored} song(s) from before I was disconnected.")
+
+        if not hasattr(player, "home_channel"):
+            player.home_channel = ctx.channel  # type:ignore
+        elif player.home_channel != ctx.channel:  # type:ignore
+            await ctx.send(
+                f"I'm already in a channel: {player.home_channel.mention}."  # type:ignore
+            )
+            return
+
+        # Fetch tracks and playlists. Enable Spotify && other sources via LavaSrc
+        # Use YouTube for searching non-urls
+        player.autoplay = wavelink.AutoPlayMode.enabled
+        try:
+            tracks: wavelink.Search = await wavelink.Playable.search(query)
+        except wavelink.LavalinkLoadException as e:
+            logging.info(
+                f"""Encountered LavalinkLoadException.\n
+                         Cause: {e.cause}\nError: {e.error}\n
+                         Severity: {e.severity}\nArgs: {e.args}\n
+                         Full Error:{e}"""
+            )
+            await ctx.send(f"DEBUG: An error occurred while searching - {e}")
+            if e.error == "The playlist does not exist.":
+                new_query: str = query.split("&")[0]
+                await ctx.send(f"Couldn't find that playlist. Searching for: {new_query}")
+                tracks: wavelink.Search = await wavelink.Playable.search(new_query)
+            else:
+                logging.warn(f"Error while searching for tracks: {e}")
+                await ctx.send("The playlist couldn't be loaded. Maybe it's private?")
+                raise e
+
+        except commands.errors.CommandInvokeError as e:
+            logging.warn(f"%(filename)s: Encountered CommandInvokeError.\nArgs: {e.args}")
+            try:
+                new_query: str = query.split("&")[0]
+                tracks: wavelink.Search = await wavelink.Playable.search(new_query)
+            except Exception as e:
+                logging.warn(f"Error while searching for tracks: {e}")
+                await ctx.send("The playlist couldn't be loaded. Maybe it's private?")
+        except Exception as e:
+            logging.warn(f"Error while searching for tracks: {e}")
+            await ctx.send("The playlist couldn't be loaded. Maybe it's private?")
+
+        if not tracks:  # type:ignore
+            await ctx.send(
+                f"Sorry {ctx.author.mention}, I couldn't find any tracks that match "
+                f'"{query}".\nTry again with a different query.'
+            )
+            return
+        if self.bot.recorder:
+            self.bot.recorder.search(query, tracks)
+
+        found: list[wavelink.Playable] = (
+            tracks.tracks if isinstance(tracks, wavelink.Playlist) else tracks[:1]
+        )
+        fitted: list[wavelink.Playable] = fit_to_budget(player, found)
+        is_playlist: bool = isinstance(tracks, wavelink.Playlist)
+        if not fitted and not is_playlist and track_seconds(found[0]) > MAX_QUEUE_DURATION:
+            await ctx.send(
+                f"Sorry {ctx.author.mention}, *{found[0].title}* is too long to queue "
+                f"(limit: {MAX_QUEUE_DURATION / 3600:g} hours)."
+            )
+            return
+        if not fitted:
+            await ctx.send(
+                f"Sorry {ctx.author.mention}, "
+                + ("none of the songs in that playlist fit in " if is_playlist else "there's no room left in ")
+                + f"this server's queue (limit: {MAX_QUEUE_LENGTH} songs / {MAX_QUEUE_DURATION / 3600:g} hours)."
+            )
+            return
+        # Enqueue right after fitting, with no await in between, so concurrent `:play`s
+        # in the same guild can't each fit against the same half-filled queue.
+        for track in fitted:
+            player.queue.put(track)
+
+        if is_playlist:
+            added: int = len(fitted)
+            embed: discord.Embed = discord.Embed(
+                title="Playlist Added",
+                color=0x008000,
+            )
+            embed.set_author(
+                name=f"{ctx.author.name.title()}",
+                icon_url=(
+                    ctx.author.avatar.url
+                    if ctx.author.avatar
+                    else ctx.author.default_avatar.url
+                ),
+            )
+            embed.description = (
+                f"Added the playlist **{tracks.name}** ({added} songs) to the queue.\n"
+            )
+            if added < len(tracks.tracks):
+                embed.description += (
+                    f"The other {len(tracks.tracks) - added} songs didn't fit in this server's queue limit.\n"
+                )
+            await ctx.send(embed=embed)
+
+        else:
+            track: wavelink.Playable = fitted[0]
+            embed: discord.Embed = discord.Embed(
+                title="Song Added",
+                color=0x008000,
+            )
+            embed.set_author(
+                name=f"{ctx.author.name.title()}",
+                icon_url=(
+                    ctx.author.avatar.url
+                    if ctx.author.avatar
+                    else ctx.author.default_avatar.url
+                ),
+            )
+            embed.description = f"Added [{track.title}]({track.uri}) to the queue.\n"
+            await ctx.send(embed=embed)
+
+        if player and not player.playing:
+            await player.play(player.queue.get(), volume=30)
+        if player and player.paused:
+            await player.pause(False)
+        self.bot.reaper.touch(player)
+
+        try:
+            await ctx.message.delete()
+        except discord.HTTPException:
+            await ctx.message.add_reaction("😒")
+
+    @commands.command(name="move", aliases=CMD_ALIASES["move"])
+    async def move(self, ctx: commands.Context, *, channel: str | None = None) -> None:
+        """Change the channel of the bot."""
+        player: wavelink.Player #  = cast(wavelink.Player, ctx.voice_client)
+        # channel = channel if channel else ctx.author.voice.channel.name
+        if not await self.bot.wait_for_lavalink(ctx):
+            return
+        ######## TODO: Try to use this instead #############
+        try:
+            if (ch := ctx.author.voice.channel) and not channel:  # type:ignore
+                player = await ch.connect(cls=wavelink.Player)
+                await ctx.send(f"Successfully moved to channel: {ch.name}")
+                return
+            else:
+                ch = self.bot.channels.get(channel, ctx.author.voice.channel)
+                if not ch:
+                    await ctx.send(f"Unable to find channel: {channel}")
+                    return
+                player = await ch.connect(cls=wavelink.Player)
+                await ctx.send(f"Successfully moved to channel: {ch.name}")
+                return
+        except AttributeError:
+            await ctx.send(f"Unable to join your voice channel.")
+            return
+
+        ####################################################
+        # try:
+        #     new_channel: discord.VoiceChannel | None = self.bot.channels.get(channel, None)[1]
+        # except IndexError:
+        #     new_channel = None
+        #     logging.info(f"Could not find channel: {channel}")
+        # else:
+        #     if new_channel:
+        #         await new_channel.connect(cls=wavelink.Player)
+        # if not player:
+        #     try:
+        #         player = await ctx.author.voice.channel.connect(  # type:ignore
+        #             cls=wavelink.Player
+        #         )
+        #         player = cast(wavelink.Player, ctx.voice_client)
+        #     except AttributeError:
+        #         # self.bot.channels.get()
+        #         # ctx.guild.voice_client
+        #         # print(f"Could not join channel: {}")
+        #         await ctx.send("Join a voice channel before using this command.")
+        #         return
+        #     except discord.ClientException:
+        #         await ctx.send(
+        #             f"{ctx.author.mention} I was unable to join your voice channel. Please try again."
+        #         )
+        #         return
+        #     else:
+        #         ctx.author.voice.channel = player.channel  # type:ignore
+        #         await ctx.send(
+        #             f"Moved to channel: {ctx.author.voice.channel.name}"
+        #         )  # type:ignore
+        #         return
+        # else:
+        #     await player.connect(reconnect=True)
+
+        # try:
+        #     # TODO: Switch bot channel cmd: Make this work. It doesn't. I don't know why.
+        #     #   * It doesn't maintain the player when given a channel (via argument)
+        #     #       * It does fire the "on_voice_state_change" event
+        #     #   * It maintains the player when given no argument (switches to user's channel)
+        #     #       * It does not maintain the queue though.
+        #     # player = await ctx.author.voice.channel.connect(cls=wavelink.Player) # type:ignore
+
+        #     if channel:
+        #         queue: wavelink.Queue = player.queue
+        #         await ctx.send(f"Moving to channel: {channel}")
+        #         await player.disconnect()
+        #         player = await self.bot.channels[channel][1].connect(cls=wavelink.Player)
+        #         player = cast(wavelink.Player, ctx.voice_client)
+        #         player.queue = queue
+        #     else:
+        #         queue: wavelink.Queue = player.queue
+        #         await player.disconnect()
+        #         try:
+        #             await ctx.send(
+        #                 f"Debug: ctx.author.voice.channel.name = {ctx.author.voice.channel.name}"
+        #             )
+        #         except AttributeError as e:
+        #             await ctx.send(f"Debug: ctx.author.voice.channel = None\n{e}")
+        #         player = await self.bot.channels[ctx.author.voice.channel.name][1].connect(
+        #             cls=wavelink.Player
+        #         )  # type:ignore
+        #         player = cast(wavelink.Player, ctx.voice_client)
+        #         player.queue = queue
+        # except Exception as e:
+        #     logging.info(f"Error while moving to channel: {e}")
+        #     await ctx.reply(f"Error while moving to channel: {e}")
+
+    @commands.command(aliases=CMD_ALIASES["skip"])
+    async def skip(self, ctx: commands.Context) -> None:
+        """`:skip` - Skip the current song."""
+        player: wavelink.Player
+        if not (player := cast(wavelink.Player, ctx.voice_client)):
+            return
+        embed: discord.Embed = discord.Embed(title="Song Skipped", color=0x00FF00)
+        embed.set_author(
+            name=f"{ctx.author.name.title()} used `/{ctx.invoked_with}`",
+            icon_url=(
+                ctx.author.avatar.url
+                if ctx.author.avatar
+                else ctx.author.default_avatar.url
+            ),
+        )
+        await ctx.reply(embed=embed)
+        await player.skip(force=True)
+        try:
+            await ctx.message.delete()
+        except discord.HTTPException:
+            await ctx.message.add_reaction("😒")
+
+    @commands.command(name="toggle", aliases=CMD_ALIASES["pause_resume"])
+    async def pause_resume(self, ctx: commands.Context) -> None:
+        """`:pause` / `:resume` - Pause or resume playback."""
+        player: wavelink.Player
+        if not (player := cast(wavelink.Player, ctx.voice_client)):
+            await ctx.send("Not connected to a voice channel.")
+            return
+        await player.pause(not player.paused)
+        self.bot.reaper.touch(player)
+        await ctx.send("Playback paused." if player.paused else "Playback resumed.")
+        try:
+            await ctx.message.delete()
+        except discord.HTTPException:
+            await ctx.message.add_reaction("😒")
+        finally:
+            embed: discord.Embed = discord.Embed(
+                title=f"Song {'paused' if player.paused else 'resumed'}", color=0x00FF00
+            )
+            embed.set_author(
+                name=f"{ctx.author.name.title()} used `/{ctx.invoked_with}`",
+                icon_url=(
+                    ctx.author.avatar.url
+                    if ctx.author.avatar
+                    else ctx.author.default_avatar.url
+                ),
+            )
+            embed.description = (
+                f"{ctx.author} has paused the player."
+                if player.paused
+                else f"{ctx.author} has resumed the player."
+            )
+
+    @commands.command(name="volume", aliases=CMD_ALIASES["volume"])
+    async def volume(self, ctx: commands.Context, value: int | None = None) -> None:
+        """`:volume (0-50)` / `:vol` - Change the volume of the player."""
+        player: wavelink.Player
+        if not (player := cast(wavelink.Player, ctx.voice_client)):
+            await ctx.send("Not connected to a voice channel.")
+            return
+        if self.bot.is_owner(ctx.author):
+            match value:
+                case None:
+                    await ctx.send(f"debug: Current volume: {player.volume}")
+                    return await ctx.message.add_reaction("😒")
+                case value if value <= 1000:
+                    await player.set_volume(value)
+                    await ctx.send(f"debug: Volume set to {player.volume}")
+                    return await ctx.message.add_reaction("😒")
+                case _:
+                    await ctx.send("debug: Enter a value between 1 and 1000.")
+                    return await ctx.message.add_reaction("😒")
+        match value:
+            case None:
+                await ctx.send(f"The current volume is {player.volume}")
+            case value if value <= 50:
+                await player.set_volume(value)
+            case _:
+                await ctx.send("Enter a value between 0 and 50")
+            # await player.set_volume(value)
+        try:
+            await ctx.message.delete()
+        except discord.HTTPException:
+            await ctx.message.add_reaction("😒")
+
+    @commands.command(name="disconnect", aliases=CMD_ALIASES["disconnect"])
+    async def disconnect(self, ctx: commands.Context) -> None:
+        """`:quit` / `:dc` / `:exit` - Disconnect the player from the voice channel. Clears queue."""
+        player: wavelink.Player = cast(wavelink.Player, ctx.voice_client)
+        if not (player := cast(wavelink.Player, ctx.voice_client)):
+            return
+        self.bot.reaper.cancel(player.guild.id)  # type:ignore
+        await player.disconnect()
+        try:
+            await ctx.message.delete()
+        except discord.HTTPException:
+            await ctx.message.add_reaction("😒")
+        else:
+            embed: discord.Embed = discord.Embed(title="Disconnected", color=0xCF1020)
+            embed.set_author(
+                name=f"{ctx.author.name.title()}",
+                icon_url=(
+                    ctx.author.avatar.url
+                    if ctx.author.avatar
+                    else ctx.author.default_avatar.url
+                ),
+            )
+            embed.description = "Disconnected from voice channel."
+            await ctx.send(embed=embed)
+
+    @commands.command(name="autoplay", aliases=CMD_ALIASES["autoplay"])
+    async def toggle_autoplay(self, ctx: commands.Context, value: str | None = None) -> None:
+        """`:autoplay (on/off)` / `:ap (on/off)` - Toggle autoplay."""
+        player: wavelink.Player = cast(wavelink.Player, ctx.voice_client)
+        if not value or value.strip() == "":
+            values: dict = {
+                "on": wavelink.AutoPlayMode.enabled.value,  # 0
+                "off": wavelink.AutoPlayMode.partial.value,  # 1
+                "disabled": wavelink.AutoPlayMode.disabled.value,  # 2
+            }
+            embed: discord.Embed = discord.Embed(title="Autoplay")
+            embed.set_author(
+                name=f"{ctx.author.name.title()}\nused /{ctx.invoked_with}",
+                icon_url=(
+                    ctx.author.avatar.url
+                    if ctx.author.avatar
+                    else ctx.author.default_avatar.url
+                ),
+            )
+            embed.description = (
+                f"""
+            Autoplay is currently set to {player.autoplay}\n
+            Possible values: `on`, `off`, `disabled`\n
+            **Note**: `disabled` will disable playlists from autoplaying.\n
+            `on`: Play songs and fetch recommendations \n
+            `off`: Play songs, but don't fetch recommendations \n
+            `disabled`: Don't autoplay anything, even playlists. \n
+            """
+                if player
+                else f"""
+            Possible values: `on`, `off`, `disabled`\n
+            **Note**: `disabled` will disable playlists from autoplaying.\n
+            `on`: Play songs and fetch recommendations ({values['on']})\n
+            `off`: Play songs, but don't fetch recommendations ({values['off']})\n
+            `disabled`: Don't autoplay anything, even playlists. ({values['disabled']})\n
+            """
+            )
+            embed.set_footer(text="Toggle autoplay with `/autoplay [on/off]`")
+            await ctx.send(embed=embed)
+
+        try:
+            await ctx.message.delete()
+        except discord.HTTPException:
+            await ctx.message.add_reaction("😒")
+        if not (player := cast(wavelink.Player, ctx.voice_client)):
+            return
+        match value:
+            case "on":
+                player.autoplay = wavelink.AutoPlayMode.enabled
+            case "off":
+                player.autoplay = wavelink.AutoPlayMode.partial
+
+    @commands.command(name="queue", aliases=CMD_ALIASES["queue"])
+    async def queue(self, ctx: commands.Context) -> None:
+        """`:queue` - View the current queue."""
+        player: wavelink.Player
+        if not (player := cast(wavelink.Player, ctx.voice_client)):
+            await ctx.send("Not connected to a voice channel.")
+            return
+        if not player.queue:
+            await ctx.send("The queue is currently empty.")
+            return
+        embed = discord.Embed(title="Current Queue", timestamp=datetime.datetime.now())
+        if embed_string := await get_current_queue(player):
+            embed.description = f"The current queue:\n\n{embed_string}"
+            await ctx.send(embed=embed)
+        else:
+            await ctx.send("The queue appears to be empty.")
+        try:
+            await ctx.message.delete()
+        except discord.HTTPException:
+            pass
+
+    @commands.command(name="state", aliases=CMD_ALIASES["state"])
+    async def get_state(self, ctx: commands.Context) -> None:
+        player: wavelink.Player = cast(wavelink.Player, ctx.voice_client)
+        if not (player := cast(wavelink.Player, ctx.voice_client)):
+            await ctx.send("Not connected to a voice channel.")
+            return
+        is_paused: bool = player.paused
+        playing_track: bool = player.playing
+        channel: str = player.channel.name
+        embed = discord.Embed(title="Current State", timestamp=datetime.datetime.now())
+        embed.description = (
+            f"Paused:  {is_paused}\n" f"Playing: {playing_track}\n" f"Channel: {channel}"
+        )
+        await ctx.send(embed=embed)
+        try:
+            await ctx.message.delete()
+        except discord.HTTPException:
+            pass
+
+
+async def setup(bot: Bot) -> None:
+    await bot.add_cog(Music(bot))
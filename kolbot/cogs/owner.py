@@ -0,0 +1,175 @@
+""" Owner-only commands: debugging and hot-reloading extensions. """
+
+import datetime
+import contextlib
+import io
+import os
+import time
+import discord
+import wavelink
+from typing import cast
+from discord.ext import commands
+from kolbot.bot import Bot
+from kolbot.budgets import MAX_PAUSED_IDLE, MAX_QUEUE_DURATION, MAX_QUEUE_LENGTH
+import logging
+
+CMD_ALIASES = {
+    "debug": ["run", "exec", "x"],
+    "owner": ["own", "admin", "adm", "administrator"],
+    "reload": ["rl", "refresh", "hotload"],
+    "usage": ["budget", "budgets", "guilds"],
+}
+# How many guilds and saved queues `:usage` lists before summarizing the rest.
+USAGE_GUILDS = 15
+USAGE_SNAPSHOTS = 10
+
+
+class Owner(commands.Cog):
+    def __init__(self, bot: Bot) -> None:
+        self.bot: Bot = bot
+
+    @commands.command(name="debug", aliases=CMD_ALIASES["debug"])
+    async def debug(self, ctx: commands.Context, *, value: str | None) -> None:
+        player: wavelink.Player = cast(wavelink.Player, ctx.voice_client)
+        if not player:
+            await ctx.message.add_reaction("⏹")
+        if str(ctx.author.id) == os.environ.get("OWNER_ID") and await self.bot.is_owner(
+            ctx.author
+        ):
+            await ctx.message.add_reaction("😒")
+            if value is None:
+                await ctx.send(f"{self.bot.is_owner} No input provided.")
+                return
+        else:
+            await ctx.message.add_reaction("🚫")
+            await ctx.send(
+                f"{ctx.author.mention} You don't have permission to use this command."
+            )
+            return
+        # Expose the bot to eval/exec the same way it was before the cog split
+        bot: Bot = self.bot
+        # Redirecting stdout to capture the output of exec/eval
+        stdout: io.StringIO = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(stdout):
+                # Using eval for expressions that return a value
+                try:
+                    result: str = eval(value)
+                    if result is not None:
+                        print(result)
+                except:
+                    # Using exec for other cases
+                    exec(value)
+                output: str = stdout.getvalue()
+            await ctx.send(f"```py\n{output}\n```")
+        except Exception as e:
+            await ctx.send(f"```py\nError: {e}\n```")
+
+    @commands.command(name="owner", aliases=CMD_ALIASES["owner"])
+    async def owner(self, ctx: commands.Context) -> None:
+        msg: str = ""
+        if str(ctx.author.id) == os.environ.get("OWNER_ID") == str(self.bot.owner_id):
+            msg += f"{ctx.author.mention} Owner IDs match.\n"
+            if self.bot.is_owner(ctx.author):
+                msg += f"bot.is_owner({ctx.author.global_name}) returns True.\n"
+        embed: discord.Embed = discord.Embed(
+            title="Owner Check", description=msg, timestamp=datetime.datetime.now()
+        )
+        await ctx.send(embed=embed)
+
+    @commands.command(name="reload", aliases=CMD_ALIASES["reload"])
+    async def reload(self, ctx: commands.Context, *, extensions: str | None = None) -> None:
+        """`:reload (extension ...)` - Hot-reload command extensions. Reloads all if none given."""
+        if not await self.bot.is_owner(ctx.author):
+            await ctx.message.add_reaction("🚫")
+            await ctx.send(
+                f"{ctx.author.mention} You don't have permission to use this command."
+            )
+            return
+        names: list[str] = (
+            [
+                name if name.startswith("kolbot.") else f"kolbot.cogs.{name}"
+                for name in extensions.split()
+            ]
+            if extensions
+            else list(self.bot.extensions)
+        )
+        lines: list[str] = []
+        for name in names:
+            # `reload_extension` keeps the old module loaded if the new one fails
+            # to import or set up, so a broken edit never leaves the bot without commands.
+            loaded: bool = name in self.bot.extensions
+            action: str = "reload" if loaded else "load"
+            start: float = time.perf_counter()
+            try:
+                if loaded:
+                    await self.bot.reload_extension(name)
+                else:
+                    await self.bot.load_extension(name)
+            except commands.ExtensionError as e:
+                elapsed: float = (time.perf_counter() - start) * 1000
+                logging.warning(f"Failed to {action} {name} ({elapsed:.1f}ms): {e!r}")
+                outcome: str = "kept the old version" if loaded else "failed to load"
+                lines.append(f"❌ `{name}` - {outcome}.\n```py\n{e.__cause__ or e}\n```")
+                continue
+            elapsed: float = (time.perf_counter() - start) * 1000
+            logging.info(f"{action.title()}ed {name} in {elapsed:.1f}ms")
+            lines.append(f"✅ `{name}` - {elapsed:.1f}ms")
+        embed: discord.Embed = discord.Embed(
+            title="Reload",
+            description="\n".join(lines) or "No extensions loaded.",
+            timestamp=datetime.datetime.now(),
+        )
+        await ctx.send(embed=embed)
+
+    @commands.command(name="usage", aliases=CMD_ALIASES["usage"])
+    async def usage(self, ctx: commands.Context) -> None:
+        """`:usage` - Show each server's queue and idle usage against its budget."""
+        if not await self.bot.is_owner(ctx.author):
+            await ctx.message.add_reaction("🚫")
+            await ctx.send(
+                f"{ctx.author.mention} You don't have permission to use this command."
+            )
+            return
+        embed: discord.Embed = discord.Embed(
+            title="Guild Usage", timestamp=datetime.datetime.now()
+        )
+        embed.description = (
+            f"Budgets: {MAX_QUEUE_LENGTH} songs, {MAX_QUEUE_DURATION / 3600:g}h queued, "
+            f"{MAX_PAUSED_IDLE / 60:g}min paused."
+        )
+        # Discord rejects embeds with more than 25 fields or 6000 characters,
+        # so only the busiest guilds get a field and the rest are counted.
+        usage: dict[int, dict] = self.bot.reaper.usage()
+        busiest: list[int] = sorted(
+            usage, key=lambda guild_id: (usage[guild_id]["seconds"], usage[guild_id]["queued"]), reverse=True
+        )
+        for guild_id in busiest[:USAGE_GUILDS]:
+            use: dict = usage[guild_id]
+            value: str = (
+                f"Queued: {use['queued']}/{MAX_QUEUE_LENGTH} songs\n"
+                f"Duration: {use['seconds'] / 3600:.2f}/{MAX_QUEUE_DURATION / 3600:g}h\n"
+                f"Paused: {use['paused']}"
+            )
+            if use["evict_in"] is not None:
+                value += f" (evicted in {use['evict_in'] / 60:.1f}min)"
+            embed.add_field(name=f"{use['guild'][:100]} ({guild_id})", value=value, inline=False)
+        if len(busiest) > USAGE_GUILDS:
+            embed.set_footer(text=f"+{len(busiest) - USAGE_GUILDS} more guilds with a player.")
+        if snapshots := self.bot.reaper.snapshots:
+            largest: list[int] = sorted(snapshots, key=lambda guild_id: len(snapshots[guild_id]), reverse=True)
+            lines: list[str] = [
+                f"{guild_id}: {len(snapshots[guild_id])} songs" for guild_id in largest[:USAGE_SNAPSHOTS]
+            ]
+            if len(largest) > USAGE_SNAPSHOTS:
+                lines.append(f"+{len(largest) - USAGE_SNAPSHOTS} more")
+            embed.add_field(
+                name=f"Saved queues ({len(snapshots)})",
+                value="\n".join(lines),
+                inline=False,
+            )
+        await ctx.send(embed=embed)
+
+
+async def setup(bot: Bot) -> None:
+    await bot.add_cog(Owner(bot))
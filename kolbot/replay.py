@@ -0,0 +1,421 @@
+"""
+Replay a recorded command-traffic trace against the real command handlers.
+
+Discord and Lavalink are replaced by local fakes that count the REST calls the
+handlers make, so releases can be compared on real traffic:
+
+    python -m kolbot.replay trace.jsonl.gz --speed 10
+
+`--speed 1` replays in real time, `--speed 0` as fast as possible.
+Record a trace by running the bot with RECORD_TRACE set (see `kolbot.trace`).
+"""
+
+import os
+import sys
+import math
+import time
+import asyncio
+import argparse
+import datetime
+import logging
+import tracemalloc
+from collections import Counter, defaultdict
+from types import SimpleNamespace
+
+# The replay never talks to a real Lavalink, and must not record itself.
+os.environ.setdefault("LAVALINK_PASS", "replay")
+os.environ.pop("RECORD_TRACE", None)
+
+import discord
+import wavelink
+from discord.ext import commands
+from discord.ext.commands.view import StringView
+from kolbot.bot import EXTENSIONS, Bot
+from kolbot.trace import read_trace
+
+EVENTS = "track_start", "track_end", "track_exception", "track_stuck"
+REST: Counter = Counter()
+REST_LATENCY: float = 0.0
+
+
+async def rest_call(name: str) -> None:
+    """ Count a call that would have gone to Discord or Lavalink, optionally simulating its latency. """
+    REST[name] += 1
+    if REST_LATENCY:
+        await asyncio.sleep(REST_LATENCY)
+
+
+class FakeMessage:
+    _state = None
+    edited_at = None
+    attachments: list = []
+
+    def __init__(self, content: str, author: "FakeUser", channel: "FakeTextChannel") -> None:
+        self.id: int = id(self)
+        self.content: str = content
+        self.author: FakeUser = author
+        self.channel: FakeTextChannel = channel
+        self.guild: FakeGuild = channel.guild
+        self.created_at: datetime.datetime = discord.utils.utcnow()
+
+    async def delete(self) -> None:
+        await rest_call("discord.delete_message")
+
+    async def add_reaction(self, emoji: str) -> None:
+        await rest_call("discord.add_reaction")
+
+
+class FakeTextChannel:
+    def __init__(self, token: str, guild: "FakeGuild") -> None:
+        self.id: int = hash(token)
+        self.name: str = f"text-{token}"
+        self.mention: str = f"#{self.name}"
+        self.guild: FakeGuild = guild
+
+    async def send(self, *args, **kwargs) -> None:
+        await rest_call("discord.send_message")
+
+
+class FakeVoiceChannel:
+    def __init__(self, guild: "FakeGuild") -> None:
+        self.id: int = hash((guild.id, "voice"))
+        self.name: str = f"voice-{guild.name}"
+        self.guild: FakeGuild = guild
+        self.members: list = []
+
+    async def connect(self, *, cls: type | None = None, **kwargs) -> "FakePlayer":
+        if self.guild.voice_client:
+            raise discord.ClientException("Already connected to a voice channel.")
+        await rest_call("discord.voice_connect")
+        self.guild.voice_client = FakePlayer(self)
+        return self.guild.voice_client
+
+
+class FakeGuild:
+    def __init__(self, token: str) -> None:
+        self.id: int = hash(token)
+        self.name: str = token
+        self.voice_client: FakePlayer | None = None
+        self.voice_channel: FakeVoiceChannel = FakeVoiceChannel(self)
+        self.text_channels: dict[str, FakeTextChannel] = {}
+
+
+class FakeUser:
+    avatar = None
+    default_avatar = SimpleNamespace(url="")
+
+    def __init__(self, token: str, guild: FakeGuild) -> None:
+        self.id: int = hash(token)
+        self.name: str = token
+        self.global_name: str = token
+        self.mention: str = f"@{token}"
+        self.voice = SimpleNamespace(channel=guild.voice_channel)
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class FakePlayer:
+    """ Stands in for `wavelink.Player`, with a real `wavelink.Queue`. """
+
+    def __init__(self, channel: FakeVoiceChannel) -> None:
+        self.channel: FakeVoiceChannel = channel
+        self.guild: FakeGuild = channel.guild
+        self.queue: wavelink.Queue = wavelink.Queue()
+        self.autoplay: wavelink.AutoPlayMode = wavelink.AutoPlayMode.partial
+        self.current: wavelink.Playable | None = None
+        # Whether a track-start event has been replayed for `current` yet.
+        self.announced: bool = False
+        self.paused: bool = False
+        self.volume: int = 100
+
+    @property
+    def playing(self) -> bool:
+        return self.current is not None
+
+    async def play(self, track: wavelink.Playable, *, volume: int | None = None, **kwargs) -> None:
+        await rest_call("lavalink.play")
+        self.current = track
+        self.announced = False
+        self.volume = volume if volume is not None else self.volume
+
+    def advance(self) -> wavelink.Playable | None:
+        self.current = self.queue.get() if self.queue else None
+        self.announced = False
+        return self.current
+
+    def next_started(self, recommended: bool = False) -> wavelink.Playable | None:
+        """
+        The track a replayed track-start event refers to: the one just played, or the next in the queue.
+        A recommended start with nothing queued is an autoplay pick, so a synthetic recommendation stands in for it.
+        """
+        track: wavelink.Playable | None = (
+            self.current if self.current and not self.announced else self.advance()
+        )
+        if not track and recommended:
+            track = self.current = FakeLavalink.playable("autoplay", id(self), 3 * 60 * 1000)
+        if track:
+            track._recommended = recommended
+        self.announced = track is not None
+        return track
+
+    def finish(self, reason: str) -> None:
+        """ A replayed track-end event. A replaced track has already been swapped for the next one. """
+        if reason != "replaced":
+            self.current = None
+
+    async def pause(self, value: bool) -> None:
+        await rest_call("lavalink.pause")
+        self.paused = value
+
+    async def skip(self, *, force: bool = True) -> None:
+        await rest_call("lavalink.skip")
+        self.advance()
+
+    async def set_volume(self, value: int) -> None:
+        await rest_call("lavalink.volume")
+        self.volume = value
+
+    async def disconnect(self, **kwargs) -> None:
+        await rest_call("lavalink.destroy")
+        self.guild.voice_client = None
+
+
+class ReplayContext(commands.Context):
+    """ A context whose replies are counted instead of sent to Discord. """
+
+    async def send(self, *args, **kwargs) -> None:  # type:ignore
+        await rest_call("discord.send_message")
+
+    async def reply(self, *args, **kwargs) -> None:  # type:ignore
+        await rest_call("discord.send_message")
+
+
+class FakeLavalink:
+    """ Answers searches with synthetic tracks shaped like the ones recorded in the trace. """
+
+    def __init__(self, searches: dict[str, dict]) -> None:
+        self.searches: dict[str, dict] = searches
+
+    @staticmethod
+    def track(token: str, index: int, length: int) -> dict:
+        return {
+            "encoded": f"{token}:{index}",
+            "info": {
+                "identifier": f"{token}-{index}",
+                "isSeekable": True,
+                "author": f"artist-{token}",
+                "length": length,
+                "isStream": False,
+                "position": 0,
+                "title": f"track-{token}-{index}",
+                "uri": f"https://example.invalid/{token}/{index}",
+                "artworkUrl": None,
+                "isrc": None,
+                "sourceName": "replay",
+            },
+            "pluginInfo": {},
+            "userData": {},
+        }
+
+    @classmethod
+    def playable(cls, token: str, index: int, length: int) -> wavelink.Playable:
+        return wavelink.Playable(data=cls.track(token, index, length))  # type:ignore
+
+    async def search(self, query: str, **kwargs) -> wavelink.Search:
+        await rest_call("lavalink.search")
+        token: str = query.strip()
+        shape: dict | None = self.searches.get(token)
+        if not shape or not shape["n"]:
+            return []
+        length: int = shape["ms"] // shape["n"]
+        tracks: list[dict] = [self.track(token, i, length) for i in range(shape["n"])]
+        if shape["pl"]:
+            return wavelink.Playlist(
+                data={
+                    "info": {"name": f"playlist-{token}", "selectedTrack": -1},
+                    "tracks": tracks,
+                    "pluginInfo": {},
+                }
+            )
+        return [wavelink.Playable(data=track) for track in tracks]  # type:ignore
+
+
+class Replayer:
+    def __init__(self, bot: Bot, records: list[dict], speed: float) -> None:
+        self.bot: Bot = bot
+        self.records: list[dict] = records
+        self.speed: float = speed
+        self.guilds: dict[str, FakeGuild] = {}
+        # The latest scheduled record per guild. Each record waits for the one before it.
+        self.pending: dict[str, asyncio.Task] = {}
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: Counter = Counter()
+
+    def guild(self, token: str) -> FakeGuild:
+        if token not in self.guilds:
+            self.guilds[token] = FakeGuild(token)
+        return self.guilds[token]
+
+    async def command(self, record: dict) -> None:
+        guild: FakeGuild = self.guild(record["g"])
+        channel: FakeTextChannel = guild.text_channels.setdefault(
+            record["c"], FakeTextChannel(record["c"], guild)
+        )
+        prefix: str = self.bot.prefixes[0]
+        content: str = f"{prefix}{record['w']} {record['a']}".rstrip()
+        message: FakeMessage = FakeMessage(content, FakeUser(record["u"], guild), channel)
+
+        # Mirrors `Bot.get_context`, which needs a logged-in user to compare against.
+        view: StringView = StringView(content)
+        ctx: ReplayContext = ReplayContext(prefix=prefix, view=view, bot=self.bot, message=message)  # type:ignore
+        view.skip_string(prefix)
+        ctx.invoked_with = view.get_word()
+        ctx.command = self.bot.all_commands.get(ctx.invoked_with)
+
+        start: float = time.perf_counter()
+        await self.bot.invoke(ctx)
+        self.latencies[record["n"]].append((time.perf_counter() - start) * 1000)
+
+    async def event(self, record: dict) -> None:
+        """ Replay a wavelink event against the guild's player and run the bot's real handler for it. """
+        player: FakePlayer | None = self.guild(record["g"]).voice_client
+        if not player:
+            return
+        kind: str = record["k"]
+        if kind == "track_start":
+            if not (track := player.next_started(record.get("r", False))):
+                return
+            payload = SimpleNamespace(player=player, track=track, original=track)
+        else:
+            payload = SimpleNamespace(
+                player=player,
+                track=player.current,
+                original=player.current,
+                reason=record.get("reason"),
+                exception={"severity": record.get("severity")},
+                threshold=record.get("threshold"),
+            )
+            if kind == "track_end":
+                player.finish(record.get("reason", "finished"))
+        start: float = time.perf_counter()
+        await getattr(self.bot, f"on_wavelink_{kind}")(payload)
+        self.latencies[f"event:{kind}"].append((time.perf_counter() - start) * 1000)
+
+    async def replay_record(self, record: dict, after: asyncio.Task | None) -> None:
+        """
+        Replay one record once the guild's previous record is done, so an event never
+        overtakes the command that caused it (Lavalink only emits it afterwards).
+        A failing command or event is counted as an error instead of aborting the replay.
+        Latency is measured from when the record actually starts, not while it waits its turn.
+        """
+        if after:
+            await asyncio.wait({after})
+        is_command: bool = record["k"] == "cmd"
+        try:
+            await (self.command(record) if is_command else self.event(record))
+        except Exception as e:
+            name: str = record["n"] if is_command else f"event:{record['k']}"
+            self.errors[f"{name}: {type(e).__name__}"] += 1
+            logging.debug(f"Replay of {record} failed", exc_info=e)
+
+    def schedule(self, record: dict) -> asyncio.Task:
+        guild: str = record.get("g") or ""
+        task: asyncio.Task = asyncio.create_task(self.replay_record(record, self.pending.get(guild)))
+        self.pending[guild] = task
+        return task
+
+    async def run(self) -> float:
+        """ Replay every record at its (scaled) timestamp. Returns the wall-clock duration. """
+        tasks: list[asyncio.Task] = []
+        started: float = time.monotonic()
+        for record in self.records:
+            if record["k"] != "cmd" and record["k"] not in EVENTS:
+                continue
+            if self.speed and (delay := record["t"] / self.speed - (time.monotonic() - started)) > 0:
+                await asyncio.sleep(delay)
+            tasks.append(self.schedule(record))
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return time.monotonic() - started
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """ Nearest-rank percentile: the smallest value with at least `pct`% of values at or below it. """
+    ordered: list[float] = sorted(values)
+    return ordered[max(math.ceil(len(ordered) * pct / 100) - 1, 0)]
+
+
+def report(replayer: Replayer, duration: float, peak: int) -> str:
+    lines: list[str] = [f"Replayed in {duration:.2f}s | Peak traced memory: {peak / 1024 / 1024:.2f} MiB", ""]
+    lines.append(f"{'handler':<22}{'count':>7}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    every: list[float] = []
+    for name, values in sorted(replayer.latencies.items()):
+        every += values
+        lines.append(
+            f"{name:<22}{len(values):>7}{percentile(values, 50):>10.2f}{percentile(values, 90):>10.2f}"
+            f"{percentile(values, 99):>10.2f}{max(values):>10.2f}"
+        )
+    if every:
+        lines.append(
+            f"{'all':<22}{len(every):>7}{percentile(every, 50):>10.2f}{percentile(every, 90):>10.2f}"
+            f"{percentile(every, 99):>10.2f}{max(every):>10.2f}"
+        )
+    lines += ["", "REST calls:"]
+    lines += [f"  {name:<28}{count:>7}" for name, count in sorted(REST.items())]
+    if replayer.errors:
+        lines += ["", "Command errors:"]
+        lines += [f"  {name:<28}{count:>7}" for name, count in replayer.errors.most_common()]
+    return "\n".join(lines)
+
+
+async def replay(path: str, speed: float) -> str:
+    records: list[dict] = list(read_trace(path))
+    if not records or records[0].get("k") != "header":
+        raise SystemExit(f"{path} is not a command-traffic trace.")
+    searches: dict[str, dict] = {r["q"]: r for r in records if r["k"] == "search"}
+
+    os.makedirs("logs", exist_ok=True)
+    bot: Bot = Bot()
+    logging.getLogger().setLevel(logging.WARNING)
+    replayer: Replayer = Replayer(bot, records, speed)
+
+    async def on_command_error(ctx: commands.Context, error: commands.CommandError) -> None:
+        replayer.errors[f"{ctx.command}: {type(getattr(error, 'original', error)).__name__}"] += 1
+
+    original_search = wavelink.Playable.search
+    wavelink.Playable.search = FakeLavalink(searches).search  # type:ignore
+    try:
+        async with bot:
+            for extension in EXTENSIONS:
+                await bot.load_extension(extension)
+            bot.add_listener(on_command_error)
+            bot.channels = {}
+            bot.lavalink_ready.set()
+            tracemalloc.start()
+            duration: float = await replayer.run()
+            peak: int = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    finally:
+        wavelink.Playable.search = original_search  # type:ignore
+    return report(replayer, duration, peak)
+
+
+def main() -> None:
+    global REST_LATENCY
+    parser = argparse.ArgumentParser(prog="python -m kolbot.replay", description=__doc__.split("\n\n")[0])
+    parser.add_argument("trace", help="Trace file recorded with RECORD_TRACE.")
+    parser.add_argument(
+        "-s", "--speed", type=float, default=1.0,
+        help="Replay speed multiplier. 1 is real time, 0 is as fast as possible. (default: 1)",
+    )
+    parser.add_argument(
+        "--rest-latency", type=float, default=0.0,
+        help="Simulated latency of each Discord/Lavalink call, in milliseconds. (default: 0)",
+    )
+    args = parser.parse_args()
+    REST_LATENCY = args.rest_latency / 1000
+    print(asyncio.run(replay(args.trace, args.speed)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
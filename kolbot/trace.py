@@ -0,0 +1,130 @@
+""" Recording and reading anonymized command-traffic traces """
+
+import io
+import gzip
+import json
+import time
+import hashlib
+import secrets
+import logging
+import datetime
+import wavelink
+from typing import Iterator
+from discord.ext import commands
+
+TRACE_VERSION = 1
+# Commands whose raw arguments are harmless to keep verbatim (numbers, on/off...).
+PLAIN_ARG_COMMANDS = "volume", "autoplay"
+# Cogs that are never recorded: owner commands can carry code or secrets.
+SKIPPED_COGS = ("Owner",)
+# Records written between flushes. Commands always flush, so a crash loses at most a few events.
+FLUSH_EVERY = 20
+
+
+def open_trace(path: str, mode: str) -> io.TextIOBase:
+    """ Open a trace file, transparently gzipped when the name ends in `.gz`. """
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")  # type:ignore
+    return open(path, mode, encoding="utf-8")
+
+
+def read_trace(path: str) -> Iterator[dict]:
+    """
+    Yield the records of a trace, header first.
+    A gzipped trace cut short by a crash is read up to the last complete record.
+    """
+    with open_trace(path, "r") as trace:
+        try:
+            for line in trace:
+                if line.strip():
+                    yield json.loads(line)
+        except (EOFError, json.JSONDecodeError):
+            logging.warning(f"Trace {path} is truncated; stopping at the last full record.")
+
+
+class TraceRecorder:
+    """
+    Writes command invocations, search results and wavelink events to a JSON-lines trace.
+
+    Guild, channel and user IDs and search queries are replaced with keyed hashes.
+    The key is random per trace and never written out, so a trace can't be traced
+    back to people, but the same user or query maps to the same token throughout it.
+    Each record has a `t` offset in seconds from the start of recording and a `k` kind.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        self.key: bytes = secrets.token_bytes(16)
+        self.started: float = time.monotonic()
+        self.file: io.TextIOBase = open_trace(path, "w")
+        self.unflushed: int = 0
+        self.write(
+            {
+                "k": "header",
+                "v": TRACE_VERSION,
+                "started": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            },
+            stamp=False,
+        )
+        logging.info(f"Recording command traffic to {path}")
+
+    def token(self, value: object) -> str:
+        return hashlib.blake2b(str(value).encode(), key=self.key, digest_size=6).hexdigest()
+
+    def write(self, record: dict, stamp: bool = True) -> None:
+        if stamp:
+            record = {"t": round(time.monotonic() - self.started, 4), **record}
+        self.file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self.unflushed += 1
+        if self.unflushed >= FLUSH_EVERY:
+            self.flush()
+
+    def flush(self) -> None:
+        self.file.flush()
+        self.unflushed = 0
+
+    def command(self, ctx: commands.Context) -> None:
+        """ Record a command invocation. Called from `Bot.on_command`, before arguments are parsed. """
+        if not ctx.command or ctx.command.cog_name in SKIPPED_COGS:
+            return
+        raw: str = ctx.message.content[len(ctx.prefix or "") + len(ctx.invoked_with or "") :].strip()
+        name: str = ctx.command.name
+        if not raw or name in PLAIN_ARG_COMMANDS:
+            arg: str = raw
+        else:
+            arg = self.token(raw)
+        self.write(
+            {
+                "k": "cmd",
+                "n": name,
+                "w": ctx.invoked_with,
+                "a": arg,
+                "g": self.token(ctx.guild.id) if ctx.guild else None,
+                "c": self.token(ctx.channel.id),
+                "u": self.token(ctx.author.id),
+            }
+        )
+        self.flush()
+
+    def search(self, query: str, tracks: "wavelink.Search | None") -> None:
+        """ Record the shape of a search result, keyed by the same token as the `:play` argument. """
+        found: list[wavelink.Playable] = (
+            tracks.tracks if isinstance(tracks, wavelink.Playlist) else list(tracks or [])
+        )
+        self.write(
+            {
+                "k": "search",
+                "q": self.token(query.strip()),
+                "pl": isinstance(tracks, wavelink.Playlist),
+                "n": len(found),
+                "ms": sum(track.length for track in found if not track.is_stream),
+            }
+        )
+
+    def event(self, name: str, guild_id: int, **fields) -> None:
+        """ Record a wavelink event for a guild. """
+        self.write({"k": name, "g": self.token(guild_id), **fields})
+
+    def close(self) -> None:
+        self.file.close()
+        logging.info(f"Closed command traffic trace {self.path}")